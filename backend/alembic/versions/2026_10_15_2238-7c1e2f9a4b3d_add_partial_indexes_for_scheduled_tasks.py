@@ -0,0 +1,78 @@
+"""add partial indexes for scheduled tasks
+
+Revision ID: 7c1e2f9a4b3d
+Revises: d444405a5285
+Create Date: 2026-10-15 22:38:34.000000+00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "7c1e2f9a4b3d"
+down_revision = "d444405a5285"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade migrations."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_content_draft_reject_created",
+            "contents",
+            ["created_at"],
+            unique=False,
+            postgresql_where=sa.text("status IN ('DRAFT', 'REJECTED')"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_post_scheduled_due",
+            "posts",
+            ["scheduled_for"],
+            unique=False,
+            postgresql_where=sa.text("status = 'SCHEDULED'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_post_failed_retry",
+            "posts",
+            ["id"],
+            unique=False,
+            postgresql_where=sa.text("status = 'FAILED' AND retry_count < 3"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_sa_expiring",
+            "social_accounts",
+            ["token_expires_at"],
+            unique=False,
+            postgresql_where=sa.text("is_active"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade migrations."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_sa_expiring",
+            table_name="social_accounts",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_post_failed_retry",
+            table_name="posts",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_post_scheduled_due",
+            table_name="posts",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_content_draft_reject_created",
+            table_name="contents",
+            postgresql_concurrently=True,
+        )
@@ -240,8 +240,8 @@ async def analyze_video(
         # Step 3: Analyze frames with Gemini Vision (FREE)
         description = await analyze_frames_with_gemini(frames, request.duration)
 
-        # Step 4: Cleanup
-        cleanup_temp_files(video_path, frames)
+        # Step 4: Cleanup (off the event loop)
+        await asyncio.to_thread(cleanup_temp_files, video_path, frames)
 
         print(f"[Video Analysis] Analysis complete!")
         print(f"[Video Analysis] Description length: {len(description)} chars")
@@ -325,16 +325,16 @@ async def extract_video_frames(video_path: str, num_frames: int = 5) -> list[str
         ret, frame = cap.read()
 
         if ret:
-            # Resize frame to reduce size (max 1024px width)
+            # Resize frame to reduce size (max 512px width; Gemini downsamples anyway)
             height, width = frame.shape[:2]
-            if width > 1024:
-                scale = 1024 / width
-                new_width = 1024
+            if width > 512:
+                scale = 512 / width
+                new_width = 512
                 new_height = int(height * scale)
                 frame = cv2.resize(frame, (new_width, new_height))
 
-            # Convert to JPEG with good quality
-            _, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+            # Convert to JPEG (quality 75 keeps the upload payload small)
+            _, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 75])
             frame_base64 = base64.b64encode(buffer).decode("utf-8")
             frames.append(frame_base64)
             print(f"[Frame Extraction] Extracted frame {len(frames)}/{num_frames}")
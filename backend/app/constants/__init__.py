@@ -167,4 +167,5 @@ CACHE_TTL = {
     "social_accounts": 60,  # 1 minute
     "content_list": 30,  # 30 seconds
     "platform_config": 3600,  # 1 hour
+    "keyword_extraction": 3600,  # 1 hour
 }
@@ -1,7 +1,8 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import scoped_session, sessionmaker
 from typing import AsyncGenerator
 from app.core.config import settings
 from loguru import logger
@@ -18,10 +19,21 @@ async_engine = create_async_engine(
 
 # Sync engine for Alembic migrations
 if settings.DATABASE_URL_SYNC:
+    sync_engine_options = {}
+    if make_url(settings.DATABASE_URL_SYNC).get_driver_name() == "psycopg2":
+        # Batch executemany() through psycopg2's fast paths: multi-row VALUES
+        # for INSERTs and execute_batch for UPDATE/DELETE
+        sync_engine_options = {
+            "executemany_mode": "values_plus_batch",
+            "insertmanyvalues_page_size": 1000,
+            "executemany_batch_page_size": 500,
+        }
+
     sync_engine = create_engine(
         settings.DATABASE_URL_SYNC,
         echo=settings.DEBUG,
         pool_pre_ping=True,
+        **sync_engine_options,
     )
 else:
     sync_engine = None
@@ -45,6 +57,17 @@ if sync_engine is not None:
         autoflush=False,
         bind=sync_engine,
     )
+
+    # Thread-local session for Celery tasks; removed after each task by
+    # app.tasks.base.DBTask
+    ScopedSession = scoped_session(
+        sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+            bind=sync_engine,
+        )
+    )
 else:
 
     class _MissingSession:
@@ -54,7 +77,11 @@ else:
                 "Set DATABASE_URL_SYNC in your environment to enable sync sessions (used by Alembic/Celery)."
             )
 
+        def remove(self):
+            """No session is ever created, so there is nothing to remove."""
+
     SessionLocal = _MissingSession()
+    ScopedSession = _MissingSession()
 
 # Base class for models
 Base = declarative_base()
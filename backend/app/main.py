@@ -9,6 +9,7 @@ import time
 
 from app.core.config import settings
 from app.database import create_tables
+from app.utils.image_utils import preload_fonts
 from loguru import logger
 
 # Import routers
@@ -46,6 +47,10 @@ async def lifespan(app: FastAPI):
     audio_dir.mkdir(parents=True, exist_ok=True)
     logger.info(f"Audio directory ready: {audio_dir.absolute()}")
 
+    # Load caption fonts for the common sizes up front
+    preload_fonts()
+    logger.info("Caption fonts preloaded")
+
     yield
 
     # Shutdown
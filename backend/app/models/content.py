@@ -8,6 +8,8 @@ from sqlalchemy import (
     ForeignKey,
     Enum as SQLEnum,
     JSON,
+    Index,
+    text,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -26,6 +28,14 @@ class ContentStatus(str, enum.Enum):
 
 class Content(Base):
     __tablename__ = "contents"
+    __table_args__ = (
+        # Partial index for the cleanup_old_content task's selector
+        Index(
+            "idx_content_draft_reject_created",
+            "created_at",
+            postgresql_where=text("status IN ('DRAFT', 'REJECTED')"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(
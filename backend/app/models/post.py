@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Enum as SQLEnum, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Enum as SQLEnum, JSON, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -13,6 +13,20 @@ class PostStatus(str, enum.Enum):
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # Partial indexes for the process_scheduled_posts and
+        # retry_failed_posts task selectors
+        Index(
+            "idx_post_scheduled_due",
+            "scheduled_for",
+            postgresql_where=text("status = 'SCHEDULED'"),
+        ),
+        Index(
+            "idx_post_failed_retry",
+            "id",
+            postgresql_where=text("status = 'FAILED' AND retry_count < 3"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
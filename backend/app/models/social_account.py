@@ -7,6 +7,8 @@ from sqlalchemy import (
     ForeignKey,
     Enum as SQLEnum,
     JSON,
+    Index,
+    text,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -24,6 +26,14 @@ class PlatformType(str, enum.Enum):
 
 class SocialAccount(Base):
     __tablename__ = "social_accounts"
+    __table_args__ = (
+        # Partial index for the refresh_expired_tokens task's selector
+        Index(
+            "idx_sa_expiring",
+            "token_expires_at",
+            postgresql_where=text("is_active"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(
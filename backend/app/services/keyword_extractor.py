@@ -1,8 +1,24 @@
 import httpx
-from typing import List
+from typing import Dict, List, Tuple
 from app.core.config import settings
+from app.constants import CACHE_TTL
+import hashlib
 import json
 import re
+import time
+
+# Most prompts kept in the keyword cache; the oldest entry is evicted first
+KEYWORD_CACHE_MAX_ENTRIES = 256
+
+# Extracted keywords by prompt digest, as (expires_at, keywords). Shared by
+# every KeywordExtractorService instance in the process.
+_keyword_cache: Dict[str, Tuple[float, str]] = {}
+
+
+def _keyword_cache_key(prompt: str, max_keywords: int, model: str) -> str:
+    """Build a fixed-size cache key for a prompt and extraction settings."""
+    digest = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+    return f"{model}:{max_keywords}:{digest}"
 
 
 class KeywordExtractorService:
@@ -33,6 +49,12 @@ class KeywordExtractorService:
             # Fallback: Simple extraction if API key not configured
             return self._simple_keyword_extraction(prompt, max_keywords)
 
+        # Repeat prompts skip the Gemini round trip
+        cache_key = _keyword_cache_key(prompt, max_keywords, model)
+        cached = _keyword_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
         extraction_prompt = f"""Extract ONLY {max_keywords} core keywords from this prompt that would be best for searching stock videos.
 
 Rules:
@@ -89,8 +111,20 @@ Return only the keywords, nothing else:"""
                 
                 print(f"[Keyword Extraction] Original prompt length: {len(prompt)}")
                 print(f"[Keyword Extraction] Extracted keywords: {final_keywords}")
-                
-                return final_keywords if final_keywords else self._simple_keyword_extraction(prompt, max_keywords)
+
+                if not final_keywords:
+                    return self._simple_keyword_extraction(prompt, max_keywords)
+
+                # Only Gemini results are cached, so failures get retried
+                _keyword_cache.pop(cache_key, None)
+                if len(_keyword_cache) >= KEYWORD_CACHE_MAX_ENTRIES:
+                    del _keyword_cache[next(iter(_keyword_cache))]
+                _keyword_cache[cache_key] = (
+                    time.monotonic() + CACHE_TTL["keyword_extraction"],
+                    final_keywords,
+                )
+
+                return final_keywords
 
             except Exception as e:
                 print(f"[Keyword Extraction] Error: {str(e)}, using fallback")
@@ -1,4 +1,5 @@
 # backend/app/services/video_audio_service.py
+import asyncio
 import httpx
 import base64
 import tempfile
@@ -8,6 +9,29 @@ from typing import Dict, List
 from app.core.config import settings
 from app.services.free_tts_service import FreeTTSService, VOICE_PRESETS
 
+# Typical voiceover pace, used to size the narration to the clip length
+NARRATION_WORDS_PER_SECOND = 2.5
+
+# Output token budget for a narration: about 2 tokens per target word (English
+# prose plus punctuation), a fixed margin, and a ceiling
+NARRATION_TOKENS_PER_WORD = 2
+NARRATION_TOKEN_MARGIN = 50
+NARRATION_MAX_TOKENS = 600
+
+# Strong references to in-flight cleanup tasks so they aren't garbage collected
+_cleanup_tasks: set = set()
+
+
+def _safe_unlink(path: str) -> None:
+    """Remove a temp file, ignoring files that are already gone."""
+    try:
+        os.remove(path)
+        print(f"[Cleanup] ✅ Removed temp video: {path}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"[Cleanup] ⚠️  Failed to remove temp file: {str(e)}")
+
 
 class VideoAudioService:
     """
@@ -82,16 +106,16 @@ class VideoAudioService:
             ret, frame = cap.read()
             
             if ret:
-                # Resize frame to reduce size (max 1024px width)
+                # Resize frame to reduce size (max 512px width; Gemini downsamples anyway)
                 height, width = frame.shape[:2]
-                if width > 1024:
-                    scale = 1024 / width
-                    new_width = 1024
+                if width > 512:
+                    scale = 512 / width
+                    new_width = 512
                     new_height = int(height * scale)
                     frame = cv2.resize(frame, (new_width, new_height))
                 
-                # Convert to JPEG with good quality
-                _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+                # Convert to JPEG (quality 75 keeps the upload payload small)
+                _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 75])
                 frame_base64 = base64.b64encode(buffer).decode('utf-8')
                 frames.append(frame_base64)
                 print(f"[Frame Extraction] Extracted frame {len(frames)}/{num_frames}")
@@ -121,6 +145,14 @@ class VideoAudioService:
                 "Get a FREE API key from: https://aistudio.google.com/app/apikey"
             )
         
+        # Size the narration (and the token budget) to the clip length so short
+        # videos don't pay for a full-length script
+        target_words = max(15, int(duration * NARRATION_WORDS_PER_SECOND))
+        max_tokens = min(
+            NARRATION_MAX_TOKENS,
+            target_words * NARRATION_TOKENS_PER_WORD + NARRATION_TOKEN_MARGIN,
+        )
+
         # Enhanced prompt for better narration
         prompt = f"""You are a professional video narrator creating voiceover narration for a {duration:.1f}-second video.
 
@@ -132,7 +164,7 @@ Analyze these {len(frames)} frames from the video and create a compelling narrat
 4. **Includes smooth transitions** between different moments in the video
 5. **Focuses on visual elements**: actions, people, objects, settings, colors, movements
 6. **Creates atmosphere and mood** through your word choices
-7. **Is approximately 30-60 seconds of spoken narration** (around 100-200 words)
+7. **Fits the length of the video** (around {target_words} words of spoken narration)
 8. **Starts directly with the narration** - no preamble or introduction
 
 CRITICAL RULES:
@@ -171,7 +203,7 @@ Begin your narration:"""
                 }],
                 "generationConfig": {
                     "temperature": 0.8,  # More creative
-                    "maxOutputTokens": 600,
+                    "maxOutputTokens": max_tokens,
                     "topP": 0.95,
                     "topK": 40
                 }
@@ -326,10 +358,9 @@ Begin your narration:"""
             }
             
         finally:
-            # Cleanup temporary video file
-            if video_path and os.path.exists(video_path):
-                try:
-                    os.remove(video_path)
-                    print(f"[Cleanup] ✅ Removed temp video: {video_path}")
-                except Exception as e:
-                    print(f"[Cleanup] ⚠️  Failed to remove temp file: {str(e)}")
\ No newline at end of file
+            # Cleanup temporary video file off the event loop, without
+            # holding up the response
+            if video_path:
+                task = asyncio.create_task(asyncio.to_thread(_safe_unlink, video_path))
+                _cleanup_tasks.add(task)
+                task.add_done_callback(_cleanup_tasks.discard)
\ No newline at end of file
@@ -0,0 +1,17 @@
+from celery import Task
+from app.database import ScopedSession
+
+
+class DBTask(Task):
+    """
+    Base class for Celery tasks that use the database.
+
+    Tasks get their session from ScopedSession(); it is closed and its
+    connection returned to the pool once the task returns, whatever the
+    outcome.
+    """
+
+    abstract = True
+
+    def after_return(self, *args, **kwargs):
+        ScopedSession.remove()
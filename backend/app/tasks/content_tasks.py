@@ -1,46 +1,60 @@
 from app.celery_app import celery_app
-from app.database import SessionLocal
+from app.database import ScopedSession
+from app.tasks.base import DBTask
 from app.models.content import Content, ContentStatus
 from datetime import datetime, timedelta
-from sqlalchemy import select
+from sqlalchemy import JSON, cast, delete, func, select, update
+from sqlalchemy.dialects.postgresql import JSONB
 
+# Rows removed per DELETE statement in cleanup_old_content
+CLEANUP_BATCH_SIZE = 10000
 
-@celery_app.task(name="app.tasks.content_tasks.cleanup_old_content")
+
+@celery_app.task(name="app.tasks.content_tasks.cleanup_old_content", base=DBTask)
 def cleanup_old_content():
     """
     Clean up old rejected or draft content (older than 90 days).
     """
-    db = SessionLocal()
+    db = ScopedSession()
     try:
         # Calculate cutoff date (90 days ago)
         cutoff_date = datetime.utcnow() - timedelta(days=90)
 
-        # Delete old draft and rejected content
-        deleted_count = (
-            db.query(Content)
-            .filter(
+        # Delete old draft and rejected content in bounded batches, committing
+        # after each one so locks and WAL stay small on large backlogs
+        stale_ids = (
+            select(Content.id)
+            .where(
                 Content.status.in_([ContentStatus.DRAFT, ContentStatus.REJECTED]),
                 Content.created_at < cutoff_date,
             )
-            .delete(synchronize_session=False)
+            .limit(CLEANUP_BATCH_SIZE)
         )
+        deleted_count = 0
+        while True:
+            deleted = db.execute(
+                delete(Content)
+                .where(Content.id.in_(stale_ids.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
 
-        db.commit()
+            deleted_count += deleted
+            if deleted < CLEANUP_BATCH_SIZE:
+                break
 
         return {"deleted": deleted_count, "cutoff_date": cutoff_date.isoformat()}
     except Exception as e:
         db.rollback()
         return {"error": str(e)}
-    finally:
-        db.close()
 
 
-@celery_app.task(name="app.tasks.content_tasks.auto_approve_content")
+@celery_app.task(name="app.tasks.content_tasks.auto_approve_content", base=DBTask)
 def auto_approve_content(content_id: int):
     """
     Auto-approve content after generation if requested.
     """
-    db = SessionLocal()
+    db = ScopedSession()
     try:
         content = db.query(Content).filter(Content.id == content_id).first()
 
@@ -61,33 +75,28 @@ def auto_approve_content(content_id: int):
     except Exception as e:
         db.rollback()
         return {"error": str(e)}
-    finally:
-        db.close()
 
 
-@celery_app.task(name="app.tasks.content_tasks.regenerate_failed_content")
+@celery_app.task(name="app.tasks.content_tasks.regenerate_failed_content", base=DBTask)
 def regenerate_failed_content():
     """
     Retry generating content that failed.
     """
-    db = SessionLocal()
+    db = ScopedSession()
     try:
         # Get failed content from last 24 hours
         cutoff = datetime.utcnow() - timedelta(hours=24)
 
-        failed_contents = (
-            db.query(Content)
-            .filter(
+        # Reset to pending in one statement instead of one UPDATE per row
+        result = db.execute(
+            update(Content)
+            .where(
                 Content.status == ContentStatus.FAILED, Content.created_at >= cutoff
             )
-            .all()
+            .values(status=ContentStatus.PENDING_APPROVAL)
+            .execution_options(synchronize_session=False)
         )
-
-        retried = 0
-        for content in failed_contents:
-            # Reset to pending and trigger regeneration
-            content.status = ContentStatus.PENDING_APPROVAL
-            retried += 1
+        retried = result.rowcount
 
         db.commit()
 
@@ -95,41 +104,36 @@ def regenerate_failed_content():
     except Exception as e:
         db.rollback()
         return {"error": str(e)}
-    finally:
-        db.close()
 
 
-@celery_app.task(name="app.tasks.content_tasks.archive_old_published_content")
+@celery_app.task(name="app.tasks.content_tasks.archive_old_published_content", base=DBTask)
 def archive_old_published_content():
     """
     Archive published content older than 180 days.
     """
-    db = SessionLocal()
+    db = ScopedSession()
     try:
         cutoff_date = datetime.utcnow() - timedelta(days=180)
 
-        # Update extra_data to mark as archived (using the property)
-        contents = (
-            db.query(Content)
-            .filter(
+        # Mark rows as archived with a single server-side UPDATE. extra_data is
+        # a plain JSON column, so merge as JSONB and cast back; the timestamp
+        # also comes from the database so no values are bound per row.
+        archived_data = cast(
+            func.coalesce(cast(Content.extra_data, JSONB), func.jsonb_build_object()).op("||")(
+                func.jsonb_build_object("archived", True, "archived_at", func.now())
+            ),
+            JSON,
+        )
+        result = db.execute(
+            update(Content)
+            .where(
                 Content.status == ContentStatus.PUBLISHED,
                 Content.created_at < cutoff_date,
             )
-            .all()
+            .values(extra_data=archived_data)
+            .execution_options(synchronize_session=False)
         )
-
-        archived = 0
-        for content in contents:
-            # Use the JSON `extra_data` column safely (was previously `metadata`)
-            current_data = content.extra_data or {}
-            # create a new dict to ensure SQLAlchemy detects changes
-            updated = {
-                **current_data,
-                "archived": True,
-                "archived_at": datetime.utcnow().isoformat(),
-            }
-            content.extra_data = updated
-            archived += 1
+        archived = result.rowcount
 
         db.commit()
 
@@ -137,5 +141,3 @@ def archive_old_published_content():
     except Exception as e:
         db.rollback()
         return {"error": str(e)}
-    finally:
-        db.close()
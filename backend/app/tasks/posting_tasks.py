@@ -1,52 +1,103 @@
 from app.celery_app import celery_app
-from app.database import SessionLocal
+from celery import group
+from celery.signals import worker_process_init, worker_process_shutdown
+from app.database import ScopedSession
+from app.tasks.base import DBTask
 from app.models.post import Post, PostStatus
 from app.models.social_account import SocialAccount
 from app.models.content import Content
 from app.services.social_media_poster import SocialMediaPosterService
 from datetime import datetime, timedelta
-from sqlalchemy import select
+from sqlalchemy import select, update
 from loguru import logger
+import asyncio
 
+# Event loop shared by all tasks in this worker process, used to drive the
+# async poster service from sync Celery tasks
+_loop = None
 
-@celery_app.task(name="app.tasks.posting_tasks.publish_post")
+
+@worker_process_init.connect
+def init_worker_event_loop(**kwargs):
+    """Create the worker-scoped event loop when a worker process starts."""
+    _get_event_loop()
+
+
+@worker_process_shutdown.connect
+def close_worker_event_loop(**kwargs):
+    """Close the worker-scoped event loop when a worker process exits."""
+    global _loop
+    if _loop is not None and not _loop.is_closed():
+        _loop.close()
+    _loop = None
+
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the worker-scoped event loop, creating it if needed."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def _mark_post_failed(db, post_id: int, error_message: str, count_retry: bool = False):
+    """
+    Mark a post as failed with a single UPDATE and commit.
+
+    The retry counter is incremented by the database rather than read back
+    into Python first.
+    """
+    values = {"status": PostStatus.FAILED, "error_message": error_message}
+    if count_retry:
+        values["retry_count"] = Post.retry_count + 1
+
+    db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+@celery_app.task(name="app.tasks.posting_tasks.publish_post", base=DBTask, acks_late=True)
 def publish_post(post_id: int):
     """
     Celery task to publish a post to social media.
+
+    The message is acknowledged only after the task finishes, so a worker
+    crash redelivers it; posts that are already published are skipped.
     """
-    db = SessionLocal()
+    db = ScopedSession()
 
     try:
-        # Get post
-        post = db.query(Post).filter(Post.id == post_id).first()
-
-        if not post:
+        # Get post together with its social account and content in one query
+        row = db.execute(
+            select(Post, SocialAccount, Content)
+            .outerjoin(SocialAccount, SocialAccount.id == Post.social_account_id)
+            .outerjoin(Content, Content.id == Post.content_id)
+            .where(Post.id == post_id)
+        ).one_or_none()
+
+        if not row:
             return {"error": "Post not found"}
 
+        post, social_account, content = row
+
+        if post.status == PostStatus.PUBLISHED:
+            return {"success": True, "post_id": post_id, "skipped": "already published"}
+
         # Update status
         post.status = PostStatus.POSTING
         db.commit()
 
-        # Get social account
-        social_account = (
-            db.query(SocialAccount)
-            .filter(SocialAccount.id == post.social_account_id)
-            .first()
-        )
-
         if not social_account or not social_account.is_active:
-            post.status = PostStatus.FAILED
-            post.error_message = "Social account not found or inactive"
-            db.commit()
+            _mark_post_failed(db, post_id, "Social account not found or inactive")
             return {"error": "Social account issue"}
 
-        # Get content
-        content = db.query(Content).filter(Content.id == post.content_id).first()
-
         if not content:
-            post.status = PostStatus.FAILED
-            post.error_message = "Content not found"
-            db.commit()
+            _mark_post_failed(db, post_id, "Content not found")
             return {"error": "Content not found"}
 
         # Initialize poster
@@ -62,12 +113,7 @@ def publish_post(post_id: int):
         }
 
         # Post to platform (run async in sync context)
-        import asyncio
-
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        results = loop.run_until_complete(
+        results = _get_event_loop().run_until_complete(
             poster.post_to_multiple_platforms(
                 platforms=[str(post.platform.value)],
                 captions={str(post.platform.value): post.caption},
@@ -85,12 +131,11 @@ def publish_post(post_id: int):
                 "post_id"
             )
             social_account.last_posted_at = datetime.utcnow()
+            db.commit()
         else:
-            post.status = PostStatus.FAILED
-            post.error_message = result.get("error", "Unknown error")
-            post.retry_count += 1
-
-        db.commit()
+            _mark_post_failed(
+                db, post_id, result.get("error", "Unknown error"), count_retry=True
+            )
 
         return {
             "success": result.get("success", False),
@@ -99,105 +144,128 @@ def publish_post(post_id: int):
         }
 
     except Exception as e:
-        post.status = PostStatus.FAILED
-        post.error_message = str(e)
-        post.retry_count += 1
-        db.commit()
+        # post may not be loaded yet, so fail the row by id
+        db.rollback()
+        _mark_post_failed(db, post_id, str(e), count_retry=True)
         return {"error": str(e)}
 
-    finally:
-        db.close()
-
 
-@celery_app.task(name="app.tasks.posting_tasks.process_scheduled_posts")
+@celery_app.task(name="app.tasks.posting_tasks.process_scheduled_posts", base=DBTask)
 def process_scheduled_posts():
     """
     Process all scheduled posts that are due.
     """
-    db = SessionLocal()
-
+    db = ScopedSession()
+
+    # Atomically claim posts scheduled for now or earlier: a single
+    # UPDATE ... RETURNING flips them to posting, so a concurrent or
+    # repeated beat run can never dispatch the same post twice
+    now = datetime.utcnow()
+    result = db.execute(
+        update(Post)
+        .where(Post.status == PostStatus.SCHEDULED, Post.scheduled_for <= now)
+        .values(status=PostStatus.POSTING)
+        .returning(Post.id)
+        .execution_options(synchronize_session=False)
+    )
+    post_ids = result.scalars().all()
+    db.commit()
+
+    if not post_ids:
+        return {"processed": 0}
+
+    # Queue for publishing in a single group dispatch. If the broker publish
+    # fails, hand the claimed posts back to the scheduler so the next beat run
+    # picks them up instead of leaving them stuck in posting.
     try:
-        # Get posts scheduled for now or earlier
-        now = datetime.utcnow()
-        posts = (
-            db.query(Post)
-            .filter(Post.status == PostStatus.SCHEDULED, Post.scheduled_for <= now)
-            .all()
+        group(publish_post.s(post_id) for post_id in post_ids).apply_async()
+    except Exception as e:
+        logger.error(f"Failed to dispatch scheduled posts {post_ids}: {e}")
+        db.rollback()
+        db.execute(
+            update(Post)
+            .where(Post.id.in_(post_ids), Post.status == PostStatus.POSTING)
+            .values(status=PostStatus.SCHEDULED)
+            .execution_options(synchronize_session=False)
         )
+        db.commit()
+        return {"error": str(e), "processed": 0}
+    processed = len(post_ids)
 
-        processed = 0
-        for post in posts:
-            # Queue for publishing
-            publish_post.delay(post.id)
-            processed += 1
-
-        return {"processed": processed}
-
-    finally:
-        db.close()
+    return {"processed": processed}
 
 
-@celery_app.task(name="app.tasks.posting_tasks.retry_failed_posts")
+@celery_app.task(name="app.tasks.posting_tasks.retry_failed_posts", base=DBTask)
 def retry_failed_posts():
     """
     Retry failed posts that haven't exceeded retry limit.
     """
-    db = SessionLocal()
-
+    db = ScopedSession()
+
+    # Claim failed posts with retry count < 3 straight to posting in a single
+    # statement, then queue each one for retry. Going through scheduled would
+    # let process_scheduled_posts claim and publish the same (already due)
+    # posts as well.
+    result = db.execute(
+        update(Post)
+        .where(Post.status == PostStatus.FAILED, Post.retry_count < 3)
+        .values(status=PostStatus.POSTING)
+        .returning(Post.id)
+        .execution_options(synchronize_session=False)
+    )
+    post_ids = result.scalars().all()
+    db.commit()
+
+    if not post_ids:
+        return {"retried": 0}
+
+    # As in process_scheduled_posts, a failed dispatch hands the posts back to
+    # the scheduler rather than leaving them stuck in posting
     try:
-        # Get failed posts with retry count < 3
-        posts = (
-            db.query(Post)
-            .filter(Post.status == PostStatus.FAILED, Post.retry_count < 3)
-            .all()
+        group(publish_post.s(post_id) for post_id in post_ids).apply_async()
+    except Exception as e:
+        logger.error(f"Failed to dispatch retried posts {post_ids}: {e}")
+        db.rollback()
+        db.execute(
+            update(Post)
+            .where(Post.id.in_(post_ids), Post.status == PostStatus.POSTING)
+            .values(status=PostStatus.SCHEDULED)
+            .execution_options(synchronize_session=False)
         )
+        db.commit()
+        return {"error": str(e), "retried": 0}
+    retried = len(post_ids)
 
-        retried = 0
-        for post in posts:
-            # Reset status and queue for retry
-            post.status = PostStatus.SCHEDULED
-            db.commit()
-
-            publish_post.delay(post.id)
-            retried += 1
-
-        return {"retried": retried}
-
-    finally:
-        db.close()
+    return {"retried": retried}
 
 
-@celery_app.task(name="app.tasks.posting_tasks.refresh_expired_tokens")
+@celery_app.task(name="app.tasks.posting_tasks.refresh_expired_tokens", base=DBTask)
 def refresh_expired_tokens():
     """
     Refresh expired social media account tokens.
     """
-    db = SessionLocal()
-
-    try:
-        # Get accounts with expired tokens (within next 7 days)
-        week_from_now = datetime.utcnow() + timedelta(days=7)
-
-        accounts = (
-            db.query(SocialAccount)
-            .filter(
-                SocialAccount.is_active == True,
-                SocialAccount.token_expires_at <= week_from_now,
-            )
-            .all()
-        )
+    db = ScopedSession()
 
-        refreshed = 0
-        for account in accounts:
-            # Platform-specific token refresh not implemented yet.
-            logger.warning(
-                "token.refresh not implemented for account",
-                account_id=account.id,
-                platform=account.platform,
-            )
-            refreshed += 1
+    # Get accounts with expired tokens (within next 7 days)
+    week_from_now = datetime.utcnow() + timedelta(days=7)
 
-        return {"refreshed": refreshed}
+    accounts = (
+        db.query(SocialAccount)
+        .filter(
+            SocialAccount.is_active == True,
+            SocialAccount.token_expires_at <= week_from_now,
+        )
+        .all()
+    )
+
+    refreshed = 0
+    for account in accounts:
+        # Platform-specific token refresh not implemented yet.
+        logger.warning(
+            "token.refresh not implemented for account",
+            account_id=account.id,
+            platform=account.platform,
+        )
+        refreshed += 1
 
-    finally:
-        db.close()
+    return {"refreshed": refreshed}
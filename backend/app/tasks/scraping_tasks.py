@@ -1,9 +1,28 @@
 from app.celery_app import celery_app
+from celery import chord, group
 import httpx
 from typing import List, Dict
+from itertools import chain
 import json
 
 
+# Placeholder trend data until the real platform APIs are wired in
+_TWITTER_PLACEHOLDER_TRENDS = (
+    {"name": "#TrendingNow", "tweet_volume": 50000},
+    {"name": "#Technology", "tweet_volume": 30000},
+)
+
+_GOOGLE_PLACEHOLDER_TRENDS = (
+    {"title": "Breaking News", "traffic": "100K+"},
+    {"title": "Tech Innovation", "traffic": "50K+"},
+)
+
+_REDDIT_PLACEHOLDER_TRENDS = (
+    {"title": "Hot Topic 1", "score": 5000, "subreddit": "r/all"},
+    {"title": "Hot Topic 2", "score": 3000, "subreddit": "r/technology"},
+)
+
+
 @celery_app.task(name="app.tasks.scraping_tasks.scrape_twitter_trends")
 def scrape_twitter_trends() -> Dict:
     """
@@ -12,10 +31,7 @@ def scrape_twitter_trends() -> Dict:
     """
     try:
         # Placeholder - implement with actual Twitter API
-        trends = [
-            {"name": "#TrendingNow", "tweet_volume": 50000},
-            {"name": "#Technology", "tweet_volume": 30000},
-        ]
+        trends = list(_TWITTER_PLACEHOLDER_TRENDS)
         
         return {
             "success": True,
@@ -37,10 +53,7 @@ def scrape_google_trends() -> Dict:
     """
     try:
         # Using pytrends or direct API
-        trends = [
-            {"title": "Breaking News", "traffic": "100K+"},
-            {"title": "Tech Innovation", "traffic": "50K+"},
-        ]
+        trends = list(_GOOGLE_PLACEHOLDER_TRENDS)
         
         return {
             "success": True,
@@ -62,10 +75,7 @@ def scrape_reddit_trends() -> Dict:
     """
     try:
         # Using PRAW or Reddit API
-        trends = [
-            {"title": "Hot Topic 1", "score": 5000, "subreddit": "r/all"},
-            {"title": "Hot Topic 2", "score": 3000, "subreddit": "r/technology"},
-        ]
+        trends = list(_REDDIT_PLACEHOLDER_TRENDS)
         
         return {
             "success": True,
@@ -84,29 +94,57 @@ def scrape_reddit_trends() -> Dict:
 def scrape_all_trends() -> Dict:
     """
     Scrape trending topics from all platforms.
+
+    The per-platform scrapers run concurrently as a Celery group; their
+    results are combined by combine_trend_results once all of them finish.
+    This task only queues that chord and doesn't wait for it: it returns
+    {"queued": True, "task_id": ...}, and the aggregated trends (in the
+    {"success", "total_trends", "platforms"} shape this task used to return)
+    are the result of that task id, e.g. AsyncResult(task_id).get().
     """
+    job = chord(
+        group(
+            scrape_twitter_trends.s(),
+            scrape_google_trends.s(),
+            scrape_reddit_trends.s(),
+        ),
+        combine_trend_results.s(),
+    ).apply_async()
+
+    return {
+        "queued": True,
+        "task_id": job.id,
+    }
+
+
+@celery_app.task(name="app.tasks.scraping_tasks.combine_trend_results")
+def combine_trend_results(platform_results: List[Dict]) -> Dict:
+    """
+    Combine the per-platform scrape results from scrape_all_trends.
+    Reports success if at least one platform scraper succeeded.
+    """
+    twitter_result, google_result, reddit_result = platform_results
+
     results = {}
-    
-    # Scrape from multiple platforms
-    twitter_result = scrape_twitter_trends()
-    google_result = scrape_google_trends()
-    reddit_result = scrape_reddit_trends()
-    
     results["twitter"] = twitter_result
     results["google"] = google_result
     results["reddit"] = reddit_result
     
-    # Combine all trends
+    # Combine and deduplicate trends (case-insensitive, first occurrence wins)
     all_trends = []
-    if twitter_result.get("success"):
-        all_trends.extend(twitter_result.get("trends", []))
-    if google_result.get("success"):
-        all_trends.extend(google_result.get("trends", []))
-    if reddit_result.get("success"):
-        all_trends.extend(reddit_result.get("trends", []))
+    seen = set()
+    for trend in chain.from_iterable(
+        result.get("trends", [])
+        for result in (twitter_result, google_result, reddit_result)
+        if result.get("success")
+    ):
+        key = trend.get("name") or trend.get("title")
+        if key and key.lower() not in seen:
+            seen.add(key.lower())
+            all_trends.append(trend)
     
     return {
-        "success": True,
+        "success": any(result.get("success") for result in platform_results),
         "total_trends": len(all_trends),
         "platforms": results
     }
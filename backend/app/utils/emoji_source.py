@@ -0,0 +1,91 @@
+"""
+Local Twemoji image source for Pilmoji.
+"""
+
+from pilmoji.source import BaseSource, Twemoji
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Optional
+import os
+import threading
+
+
+# Directory holding the Twemoji 72x72 PNG set (filled in the Docker build)
+EMOJI_DIR = Path(os.getenv("EMOJI_DIR", "uploads/emoji"))
+
+ZERO_WIDTH_JOINER = "\u200d"
+VARIATION_SELECTOR_16 = "\ufe0f"
+
+
+def twemoji_filename(emoji: str) -> str:
+    """
+    Build the Twemoji asset file name for an emoji.
+
+    Twemoji names files by lowercase hex code points joined with "-", and
+    drops the U+FE0F variation selector unless the emoji is a ZWJ sequence.
+
+    Args:
+        emoji: Emoji character or sequence
+
+    Returns:
+        File name such as "1f389.png"
+    """
+    if ZERO_WIDTH_JOINER not in emoji:
+        emoji = emoji.replace(VARIATION_SELECTOR_16, "")
+    return "-".join(f"{ord(char):x}" for char in emoji) + ".png"
+
+
+class LocalTwemojiSource(BaseSource):
+    """
+    Twemoji source that reads emoji PNGs from EMOJI_DIR.
+
+    Emojis missing from the local set fall back to the Twemoji CDN. Image
+    bytes are kept in memory, so one instance can be shared by every
+    Pilmoji render in the process. This isn't an HTTP-based source, so
+    Pilmoji never swaps or closes a session on it and renders running
+    concurrently on several threads can share it safely.
+
+    Pilmoji draws an emoji as plain text when no image is found, without
+    raising, so lookups that come back empty are counted per thread; compare
+    miss_count() before and after a render to tell if it was complete.
+    """
+
+    def __init__(self, emoji_dir: Path = EMOJI_DIR) -> None:
+        self.emoji_dir = emoji_dir
+        self._images: Dict[str, bytes] = {}
+        self._local = threading.local()
+
+    def miss_count(self) -> int:
+        """Return how many emoji lookups on this thread found no image."""
+        return getattr(self._local, "misses", 0)
+
+    def get_emoji(self, emoji: str, /) -> Optional[BytesIO]:
+        data = self._images.get(emoji)
+        if data is None:
+            path = self.emoji_dir / twemoji_filename(emoji)
+            if path.exists():
+                data = path.read_bytes()
+            else:
+                data = self._fetch_from_cdn(emoji)
+
+            # Failed or empty CDN responses aren't cached so they can be retried
+            if not data:
+                self._local.misses = self.miss_count() + 1
+                return None
+            self._images[emoji] = data
+
+        return BytesIO(data)
+
+    def get_discord_emoji(self, id: int, /) -> Optional[BytesIO]:
+        # Captions never contain Discord custom emojis
+        return None
+
+    @staticmethod
+    def _fetch_from_cdn(emoji: str) -> Optional[bytes]:
+        """Fetch an emoji from the Twemoji CDN, returning None on any failure."""
+        try:
+            # A source per lookup keeps its HTTP session private to this call
+            stream = Twemoji().get_emoji(emoji)
+        except Exception:
+            return None
+        return stream.getvalue() if stream else None
@@ -3,13 +3,15 @@ Image utility functions for processing and manipulating images.
 """
 
 from PIL import Image, ImageDraw, ImageFont
-from pilmoji import Pilmoji
 from pathlib import Path
-import textwrap
-from typing import Tuple, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
 import re
-import requests
+import shutil
 import os
+import threading
 
 
 # Google Fonts URLs - using free fonts from GitHub repositories
@@ -28,10 +30,140 @@ GOOGLE_FONTS = {
     "impact": "https://github.com/theleagueof/league-gothic/raw/master/LeagueGothic-Regular.otf",
 }
 
+# System fonts that support emoji, in order of preference
+EMOJI_FONT_PATHS = (
+    # Windows emoji fonts
+    "C:/Windows/Fonts/seguiemj.ttf",  # Segoe UI Emoji
+    "C:/Windows/Fonts/NotoColorEmoji.ttf",
+    # Try regular fonts with better Unicode support
+    "C:/Windows/Fonts/segoeuib.ttf",  # Segoe UI Bold
+    "C:/Windows/Fonts/segoeui.ttf",  # Segoe UI
+    # macOS
+    "/System/Library/Fonts/Apple Color Emoji.ttc",
+    "/Library/Fonts/Arial Unicode.ttf",
+    # Linux
+    "/usr/share/fonts/truetype/noto/NotoColorEmoji.ttf",
+    "/usr/share/fonts/truetype/ancient-scripts/Symbola_hint.ttf",
+    "/usr/share/fonts/truetype/unifont/unifont.ttf",
+    # Common fallbacks
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "C:/Windows/Fonts/arialbd.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+)
+
+# System font paths don't change while the process runs, so stat them once
+_EXISTING_EMOJI_FONT_PATHS = tuple(
+    font_path for font_path in EMOJI_FONT_PATHS if Path(font_path).exists()
+)
+
+# Caption font sizes loaded at startup so the first request doesn't pay for
+# the font probe; other sizes are loaded (and cached) on first use
+PRELOAD_FONT_SIZES = (24, 32, 40, 48, 60)
+
+# Text measured once per font to get a line height covering ascenders and
+# descenders
+LINE_HEIGHT_PROBE = "Agy|"
+
+# Widest image we caption at; larger uploads are downsampled first since
+# social platforms display (and re-encode) at around this width anyway
+MAX_IMAGE_WIDTH = 1080
+
+# JPEG encoder settings for captioned images; platforms re-encode uploads, so
+# quality above 85 mostly adds bytes
+JPEG_SAVE_OPTIONS = {
+    "quality": 85,
+    "optimize": True,
+    "progressive": True,
+    "subsampling": 2,  # 4:2:0 chroma subsampling
+}
+
+# Emoji character ranges - matches most common emoji sequences
+_EMOJI_RANGES = (
+    "\U0001f600-\U0001f64f"  # emoticons
+    "\U0001f300-\U0001f5ff"  # symbols & pictographs
+    "\U0001f680-\U0001f6ff"  # transport & map symbols
+    "\U0001f1e0-\U0001f1ff"  # flags (iOS)
+    "\U00002702-\U000027b0"
+    "\U000024c2-\U0001f251"
+    "\U0001f900-\U0001f9ff"  # Supplemental Symbols and Pictographs
+    "\U0001fa00-\U0001fa6f"  # Chess Symbols
+    "\U0001fa70-\U0001faff"  # Symbols and Pictographs Extended-A
+    "\U00002600-\U000026ff"  # Miscellaneous Symbols
+    "\U0000203c\U00002049"  # double exclamation / exclamation question marks
+    "\U00002139"  # information source
+    "\U00002300-\U000023ff"  # Miscellaneous Technical (watch, hourglass, alarm)
+    "\U0001f7e0-\U0001f7ff"  # Geometric Shapes Extended (colored circles/squares)
+    "\U000020e3\U0000fe0f"  # keycap combiner and emoji presentation selector
+)
+
+# Single-pass tokenizer yielding (segment, is_emoji) for runs of emoji and
+# runs of everything else
+_EMOJI_SCANNER = re.Scanner(
+    [
+        (f"[{_EMOJI_RANGES}]+", lambda scanner, token: (token, True)),
+        (f"[^{_EMOJI_RANGES}]+", lambda scanner, token: (token, False)),
+    ],
+    flags=re.DOTALL,
+)
+
 # Cache directory for downloaded fonts
 FONT_CACHE_DIR = Path("uploads/fonts")
 FONT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Font files known to be in FONT_CACHE_DIR; fonts are never removed from the
+# cache, so a path only has to be checked on disk once
+_cached_font_paths: Dict[str, Path] = {}
+
+# Keep-alive HTTP session for font downloads, created on first download
+_http_session = None
+
+# Pilmoji emoji image source, created on first emoji render
+_emoji_source = None
+
+# Memory budget for cached caption strips (RGBA, 4 bytes per pixel); about
+# 8-10 full-width strips at 1080 px
+CAPTION_STRIP_CACHE_BYTES = 8 * 1024 * 1024
+
+# Rendered caption strips keyed by caption and styling, least recently used
+# first; guarded by a lock so captions can be rendered from several threads
+_caption_strip_cache: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+_caption_strip_cache_bytes = 0
+_caption_strip_cache_lock = threading.Lock()
+
+# Shared drawing context for font probes; textbbox only measures, so a tiny
+# surface is enough
+_PROBE_DRAW = ImageDraw.Draw(Image.new("RGBA", (8, 8)))
+
+
+def _get_http_session():
+    """Return the shared font download session, creating it if needed."""
+    global _http_session
+    if _http_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        _http_session = requests.Session()
+        # Pool sized for prefetch_fonts' download threads; transient errors
+        # are retried on the already-open connection
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+        )
+        _http_session.mount("https://", adapter)
+    return _http_session
+
+
+def _get_emoji_source():
+    """Return the shared local Twemoji source for Pilmoji, creating it if needed."""
+    global _emoji_source
+    if _emoji_source is None:
+        from app.utils.emoji_source import LocalTwemojiSource
+
+        _emoji_source = LocalTwemojiSource()
+    return _emoji_source
+
 
 def download_font(font_url: str, font_name: str) -> Optional[Path]:
     """
@@ -44,30 +176,112 @@ def download_font(font_url: str, font_name: str) -> Optional[Path]:
     Returns:
         Path to the downloaded font file, or None if download fails
     """
+    cache_path = _cached_font_paths.get(font_name)
+    if cache_path is not None:
+        return cache_path
+
+    tmp_path = None
     try:
         cache_path = FONT_CACHE_DIR / font_name
 
         # If already cached, return the path
         if cache_path.exists():
+            _cached_font_paths[font_name] = cache_path
             return cache_path
 
-        # Download the font
-        response = requests.get(font_url, timeout=10)
-        response.raise_for_status()
-
-        # Save to cache
-        with open(cache_path, "wb") as f:
-            f.write(response.content)
-
+        # Stream the font to a temporary file, then move it into place so
+        # concurrent callers never see a partially written font
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with _get_http_session().get(font_url, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            # Content-Length is the encoded size, so only check it when the
+            # body isn't compressed in transit
+            expected_size = None
+            if "Content-Encoding" not in response.headers:
+                expected_size = response.headers.get("Content-Length")
+
+            written = 0
+            with open(tmp_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
+                    written += len(chunk)
+
+        if expected_size is not None and written != int(expected_size):
+            raise IOError(f"incomplete download ({written} of {expected_size} bytes)")
+
+        os.replace(tmp_path, cache_path)
+        _cached_font_paths[font_name] = cache_path
         return cache_path
     except Exception as e:
         print(f"Failed to download font from {font_url}: {e}")
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
         return None
 
 
+def prefetch_fonts(families: List[str]) -> Dict[str, Optional[Path]]:
+    """
+    Download several Google Fonts concurrently into the font cache.
+
+    Args:
+        families: Font family names (keys of GOOGLE_FONTS)
+
+    Returns:
+        Mapping of family name to cached font path (None if it failed)
+    """
+    families = [family for family in dict.fromkeys(families) if family in GOOGLE_FONTS]
+    if not families:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(8, len(families))) as executor:
+        paths = executor.map(
+            lambda family: download_font(GOOGLE_FONTS[family], f"{family}.ttf"),
+            families,
+        )
+        return dict(zip(families, paths))
+
+
+@lru_cache(maxsize=64)
+def _load_truetype(font_path: str, font_size: int):
+    """
+    Load a TrueType font, reusing fonts already loaded at the same size.
+
+    Args:
+        font_path: Path to the font file
+        font_size: Size of the font
+
+    Returns:
+        ImageFont object
+    """
+    return ImageFont.truetype(font_path, font_size)
+
+
+@lru_cache(maxsize=None)
+def _font_supports_emoji(font_path: str, probe: str = "✨") -> bool:
+    """
+    Check once per font file whether it can render an emoji.
+    Emoji support doesn't depend on size, so the probe runs at a single size.
+
+    Args:
+        font_path: Path to the font file
+        probe: Emoji to measure
+
+    Returns:
+        True if the font loaded and measured the emoji
+    """
+    try:
+        font = _load_truetype(font_path, PRELOAD_FONT_SIZES[0])
+        _PROBE_DRAW.textbbox((0, 0), probe, font=font)
+        return True
+    except Exception:
+        return False
+
+
+@lru_cache(maxsize=32)
 def get_font_by_family(font_family: str, font_size: int, prefer_emoji: bool = True):
     """
     Load a font by family name from Google Fonts.
+    Results are cached per (family, size, prefer_emoji).
 
     Args:
         font_family: Font family name (roboto, open_sans, lato, etc.)
@@ -87,21 +301,14 @@ def get_font_by_family(font_family: str, font_size: int, prefer_emoji: bool = Tr
 
         if font_path:
             try:
-                font = ImageFont.truetype(str(font_path), font_size)
+                font = _load_truetype(str(font_path), font_size)
 
                 # Test if the font supports emojis
                 if prefer_emoji:
-                    test_emoji = "😀"
-                    test_img = Image.new("RGBA", (100, 100))
-                    test_draw = ImageDraw.Draw(test_img)
-
-                    try:
-                        test_draw.text((0, 0), test_emoji, font=font, fill=(255, 255, 255, 255))
-                        # If we get here, emoji is supported
+                    if _font_supports_emoji(str(font_path), "😀"):
                         return font
-                    except Exception:
-                        # Font doesn't support emojis, will try fallback
-                        print(f"Font {font_family} doesn't support emojis, using fallback")
+                    # Font doesn't support emojis, will try fallback
+                    print(f"Font {font_family} doesn't support emojis, using fallback")
             except Exception as e:
                 print(f"Failed to load font {font_family}: {e}")
 
@@ -112,10 +319,28 @@ def get_font_by_family(font_family: str, font_size: int, prefer_emoji: bool = Tr
     return font
 
 
+@lru_cache(maxsize=1)
+def _resolve_emoji_font_path() -> Optional[str]:
+    """
+    Find the first system font that can render emoji characters.
+    The lookup runs once per process; the emoji probe doesn't depend on size.
+
+    Returns:
+        Path to the font, or None if no emoji-capable font is installed
+    """
+    for font_path in _EXISTING_EMOJI_FONT_PATHS:
+        if _font_supports_emoji(font_path):
+            return font_path
+
+    return None
+
+
+@lru_cache(maxsize=32)
 def get_font_with_emoji_support(font_size: int):
     """
     Load a font that supports emoji characters.
-    First tries system fonts, then falls back to default.
+    First tries system fonts, then falls back to default. Results are cached
+    per size so repeated captions reuse the loaded font.
 
     Args:
         font_size: Size of the font
@@ -123,43 +348,12 @@ def get_font_with_emoji_support(font_size: int):
     Returns:
         ImageFont object with emoji support
     """
-    # System emoji fonts
-    emoji_font_paths = [
-        # Windows emoji fonts
-        "C:/Windows/Fonts/seguiemj.ttf",  # Segoe UI Emoji
-        "C:/Windows/Fonts/NotoColorEmoji.ttf",
-        # Try regular fonts with better Unicode support
-        "C:/Windows/Fonts/segoeuib.ttf",  # Segoe UI Bold
-        "C:/Windows/Fonts/segoeui.ttf",  # Segoe UI
-        # macOS
-        "/System/Library/Fonts/Apple Color Emoji.ttc",
-        "/Library/Fonts/Arial Unicode.ttf",
-        # Linux
-        "/usr/share/fonts/truetype/noto/NotoColorEmoji.ttf",
-        "/usr/share/fonts/truetype/ancient-scripts/Symbola_hint.ttf",
-        "/usr/share/fonts/truetype/unifont/unifont.ttf",
-        # Common fallbacks
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-        "C:/Windows/Fonts/arialbd.ttf",
-        "C:/Windows/Fonts/arial.ttf",
-    ]
-
-    font = None
-    for font_path in emoji_font_paths:
+    font_path = _resolve_emoji_font_path()
+    if font_path:
         try:
-            if Path(font_path).exists():
-                font = ImageFont.truetype(font_path, font_size)
-                # Test if the font can render an emoji
-                test_draw = ImageDraw.Draw(Image.new("RGBA", (100, 100)))
-                try:
-                    test_draw.textbbox((0, 0), "✨", font=font)
-                    # If we get here, the font can render emojis
-                    return font
-                except Exception:
-                    # Font doesn't support this emoji, try next
-                    continue
+            return _load_truetype(font_path, font_size)
         except Exception:
-            continue
+            pass
 
     # If no emoji font found, return default (emojis may not render properly)
     try:
@@ -168,6 +362,17 @@ def get_font_with_emoji_support(font_size: int):
         return None
 
 
+def preload_fonts(sizes: Tuple[int, ...] = PRELOAD_FONT_SIZES) -> None:
+    """
+    Load the emoji-capable font for common caption sizes ahead of time.
+
+    Args:
+        sizes: Font sizes to load
+    """
+    for font_size in sizes:
+        get_font_with_emoji_support(font_size)
+
+
 def split_text_and_emoji(text: str):
     """
     Split text into segments of regular text and emoji.
@@ -179,87 +384,111 @@ def split_text_and_emoji(text: str):
     Returns:
         List of tuples (text_segment, is_emoji)
     """
-    # Emoji pattern - matches most common emoji sequences
-    emoji_pattern = re.compile(
-        "["
-        "\U0001f600-\U0001f64f"  # emoticons
-        "\U0001f300-\U0001f5ff"  # symbols & pictographs
-        "\U0001f680-\U0001f6ff"  # transport & map symbols
-        "\U0001f1e0-\U0001f1ff"  # flags (iOS)
-        "\U00002702-\U000027b0"
-        "\U000024c2-\U0001f251"
-        "\U0001f900-\U0001f9ff"  # Supplemental Symbols and Pictographs
-        "\U0001fa00-\U0001fa6f"  # Chess Symbols
-        "\U0001fa70-\U0001faff"  # Symbols and Pictographs Extended-A
-        "\U00002600-\U000026ff"  # Miscellaneous Symbols
-        "]+",
-        flags=re.UNICODE,
-    )
+    # None of the emoji ranges are ASCII, so plain-ASCII text needs no scan
+    if text.isascii():
+        return [(text, False)]
+
+    segments, _ = _EMOJI_SCANNER.scan(text)
+    return segments if segments else [(text, False)]
 
-    segments = []
-    last_end = 0
 
-    for match in emoji_pattern.finditer(text):
-        # Add text before emoji
-        if match.start() > last_end:
-            segments.append((text[last_end : match.start()], False))
+def _wrap_by_pixels(text: str, font, max_width: int) -> List[str]:
+    """
+    Wrap text into lines that fit within a pixel width for the given font.
 
-        # Add emoji
-        segments.append((match.group(), True))
-        last_end = match.end()
+    Each distinct word is measured once; a line's width is the sum of its
+    word widths plus the inter-word spaces. Words wider than a whole line
+    are broken across lines at the longest prefix that fits, found by
+    binary search.
 
-    # Add remaining text
-    if last_end < len(text):
-        segments.append((text[last_end:], False))
+    Args:
+        text: Text to wrap
+        font: Font the text will be drawn with
+        max_width: Maximum line width in pixels
 
-    return segments if segments else [(text, False)]
+    Returns:
+        List of wrapped lines
+    """
+    space_width = font.getlength(" ")
+    word_widths = {}
+
+    def measure(word: str) -> float:
+        if word not in word_widths:
+            word_widths[word] = font.getlength(word)
+        return word_widths[word]
+
+    lines = []
+    current_words = []
+    current_width = 0.0
+
+    for word in text.split():
+        word_width = measure(word)
+
+        # Break words that can't fit on a line of their own
+        while word_width > max_width and len(word) > 1:
+            if current_words:
+                lines.append(" ".join(current_words))
+                current_words, current_width = [], 0.0
+            # Binary search for the longest prefix that fits (at least 1 char)
+            low, high = 1, len(word) - 1
+            while low < high:
+                mid = (low + high + 1) // 2
+                if font.getlength(word[:mid]) <= max_width:
+                    low = mid
+                else:
+                    high = mid - 1
+            cut = low
+            lines.append(word[:cut])
+            word = word[cut:]
+            word_width = measure(word)
+
+        if not current_words:
+            current_words, current_width = [word], word_width
+        elif current_width + space_width + word_width <= max_width:
+            current_words.append(word)
+            current_width += space_width + word_width
+        else:
+            lines.append(" ".join(current_words))
+            current_words, current_width = [word], word_width
 
+    if current_words:
+        lines.append(" ".join(current_words))
 
-def add_caption_to_image(
-    image_path: Path,
+    return lines
+
+
+def _render_caption_strip(
     caption: str,
-    output_path: Optional[Path] = None,
-    font_size: int = 40,
-    position: str = "bottom",
-    text_color: Tuple[int, int, int, int] = (255, 255, 255, 255),
-    bg_color: Tuple[int, int, int, int] = (0, 0, 0, 180),
-    padding: int = 20,
-    max_width_ratio: float = 0.9,
-    font_family: str = "default",
-) -> Path:
+    img_width: int,
+    font_size: int,
+    text_color: Tuple[int, int, int, int],
+    bg_color: Tuple[int, int, int, int],
+    padding: int,
+    max_width_ratio: float,
+    font_family: str,
+    use_pilmoji: bool = True,
+    outline_width: int = 0,
+) -> Tuple[Image.Image, bool]:
     """
-    Add a caption overlay to an image with full emoji support.
-
-    This function uses a hybrid approach:
-    - Regular text is rendered with the selected font family
-    - Emojis are automatically rendered with an emoji-supporting font
-    - All Google Fonts support emojis through this hybrid rendering
+    Render the caption background and text as an RGBA strip.
 
     Args:
-        image_path: Path to the input image
-        caption: Text to overlay on the image (emojis fully supported)
-        output_path: Path for the output image (if None, overwrites input)
+        caption: Text to render (emojis fully supported)
+        img_width: Width of the target image
         font_size: Size of the font
-        position: Position of the caption ("top", "bottom", "center")
         text_color: RGBA color for the text
-        bg_color: RGBA color for the background overlay
+        bg_color: RGBA color for the background
         padding: Padding around the text
         max_width_ratio: Maximum width of text as a ratio of image width
-        font_family: Font family to use (roboto, open_sans, lato, montserrat,
-                     poppins, raleway, oswald, ubuntu, playfair, merriweather,
-                     source_sans, impact, or default)
+        font_family: Font family to use (see add_caption_to_image)
+        use_pilmoji: Render emojis through Pilmoji (see add_caption_to_image)
+        outline_width: Width of the black text outline in pixels (0 for none)
 
     Returns:
-        Path to the output image
+        Tuple of the RGBA image of size (img_width, caption box height) and
+        whether it rendered completely (False if Pilmoji failed or an emoji
+        image couldn't be found, so text was drawn without emoji images)
     """
-    # Open the image
-    img = Image.open(image_path).convert("RGBA")
-    img_width, img_height = img.size
-
-    # Create a transparent overlay
-    overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
-
     # Load primary font
     if font_family == "default":
         primary_font = get_font_with_emoji_support(font_size)
@@ -272,7 +501,7 @@ def add_caption_to_image(
             font_path = download_font(font_url, font_filename)
             if font_path:
                 try:
-                    primary_font = ImageFont.truetype(str(font_path), font_size)
+                    primary_font = _load_truetype(str(font_path), font_size)
                 except Exception as e:
                     print(f"Failed to load {font_family}, using default: {e}")
                     primary_font = get_font_with_emoji_support(font_size)
@@ -291,64 +520,65 @@ def add_caption_to_image(
 
     # Wrap text to fit image width
     max_text_width = int(img_width * max_width_ratio)
+    wrapped_lines = _wrap_by_pixels(caption, primary_font, max_text_width)
 
-    # Calculate average character width (approximate)
-    try:
-        bbox = draw.textbbox((0, 0), "A", font=primary_font)
-        avg_char_width = bbox[2] - bbox[0]
-    except Exception:
-        avg_char_width = font_size // 2
-
-    chars_per_line = max(1, max_text_width // avg_char_width)
-    wrapped_lines = textwrap.wrap(caption, width=chars_per_line)
+    # Measure every line once, straight from the font: widths are advance
+    # widths, and the line height comes from one probe of the font's
+    # ascender/descender extent rather than each line's inked box
+    line_widths = [int(primary_font.getlength(line)) for line in wrapped_lines]
+    _, probe_top, _, probe_bottom = primary_font.getbbox(LINE_HEIGHT_PROBE)
+    line_height = probe_bottom - probe_top
 
-    # Calculate total text height
-    line_heights = []
-    total_height = 0
-    for line in wrapped_lines:
-        try:
-            bbox = draw.textbbox((0, 0), line, font=primary_font)
-            line_height = bbox[3] - bbox[1]
-        except Exception:
-            line_height = font_size
-        line_heights.append(line_height)
-        total_height += line_height
-
-    # Add spacing between lines
+    # Every line advances by the same amount, spacing included
     line_spacing = font_size // 4
-    total_height += line_spacing * (len(wrapped_lines) - 1) if len(wrapped_lines) > 1 else 0
+    line_advance = line_height + line_spacing
+    total_height = line_advance * len(wrapped_lines) - line_spacing if wrapped_lines else 0
 
     # Calculate background rectangle dimensions
     bg_height = total_height + (padding * 2)
     bg_width = img_width
 
-    # Determine vertical position
-    if position == "top":
-        bg_y = 0
-        text_y = padding
-    elif position == "center":
-        bg_y = (img_height - bg_height) // 2
-        text_y = bg_y + padding
-    else:  # bottom
-        bg_y = img_height - bg_height
-        text_y = bg_y + padding
+    # Build the caption on a strip covering only the background box, so the
+    # composite touches just that band instead of the whole image
+    overlay = Image.new("RGBA", (bg_width, bg_height), bg_color)
+    draw = ImageDraw.Draw(overlay)
 
-    # Draw background rectangle
-    draw.rectangle([(0, bg_y), (bg_width, bg_y + bg_height)], fill=bg_color)
+    # Coordinates are relative to the strip; shift up by the font's top
+    # bearing so the inked text sits inside the padding
+    current_y = padding - probe_top
 
-    # Draw each line of text with color emoji support using Pilmoji
-    current_y = text_y
+    # Black outline drawn by FreeType's stroker in the same pass as the text
+    stroke = {"stroke_width": outline_width, "stroke_fill": (0, 0, 0, 255)}
 
-    # Create Pilmoji instance for color emoji rendering
-    with Pilmoji(overlay) as pilmoji:
-        for line, line_height in zip(wrapped_lines, line_heights):
-            # Calculate text width for centering using primary font
-            try:
-                bbox = draw.textbbox((0, 0), line, font=primary_font)
-                text_width = bbox[2] - bbox[0]
-            except Exception:
-                text_width = len(line) * avg_char_width
+    # Plain-text captions (or callers that opted out of Pilmoji) are drawn
+    # directly, with color glyphs taken from the font itself; Pilmoji, which
+    # fetches and pastes an image per emoji, is only used for emojis
+    if not use_pilmoji or not any(
+        is_emoji for _, is_emoji in split_text_and_emoji(caption)
+    ):
+        for line, text_width in zip(wrapped_lines, line_widths):
+            text_x = (img_width - text_width) // 2
+            draw.text(
+                (text_x, current_y),
+                line,
+                font=primary_font,
+                fill=text_color,
+                embedded_color=True,
+                **stroke,
+            )
+            current_y += line_advance
+
+        return overlay, True
 
+    from pilmoji import Pilmoji
+
+    complete = True
+    emoji_source = _get_emoji_source()
+    misses_before = emoji_source.miss_count()
+
+    # Draw each line of text with color emoji support using Pilmoji
+    with Pilmoji(overlay, source=emoji_source) as pilmoji:
+        for line, text_width in zip(wrapped_lines, line_widths):
             # Start position for centered text
             text_x = (img_width - text_width) // 2
 
@@ -360,29 +590,214 @@ def add_caption_to_image(
                     font=primary_font,
                     fill=text_color,
                     emoji_scale_factor=1.0,  # Keep emojis same size as text
+                    **stroke,
                 )
             except Exception as e:
                 # Fallback to regular drawing if Pilmoji fails
                 print(f"Pilmoji failed, using fallback: {e}")
+                complete = False
                 try:
-                    draw.text((text_x, current_y), line, font=primary_font, fill=text_color)
+                    draw.text(
+                        (text_x, current_y), line, font=primary_font, fill=text_color, **stroke
+                    )
                 except:
                     pass
 
-            current_y += line_height + line_spacing
+            current_y += line_advance
 
-    # Composite the overlay onto the original image
-    img = Image.alpha_composite(img, overlay)
+    # Emojis without an image were drawn as plain text
+    if emoji_source.miss_count() != misses_before:
+        complete = False
 
-    # Save the result
+    return overlay, complete
+
+
+def _build_caption_strip(
+    caption: str,
+    img_width: int,
+    font_size: int,
+    text_color: Tuple[int, int, int, int],
+    bg_color: Tuple[int, int, int, int],
+    padding: int,
+    max_width_ratio: float,
+    font_family: str,
+    use_pilmoji: bool = True,
+    outline_width: int = 0,
+) -> Image.Image:
+    """
+    Return the caption strip, reusing a cached render when there is one.
+
+    The strip depends only on the caption and styling, not on the image's
+    pixels, so it is reused when the same caption is applied to several
+    images of the same width. The cache is bounded by CAPTION_STRIP_CACHE_BYTES
+    (least recently used strips are dropped first), and strips drawn with the
+    Pilmoji fallback or with missing emoji images are never cached so a
+    transient emoji failure isn't kept. Callers must treat the returned image
+    as read-only.
+
+    Args:
+        See _render_caption_strip
+
+    Returns:
+        RGBA image of size (img_width, caption box height)
+    """
+    global _caption_strip_cache_bytes
+
+    key = (
+        caption,
+        img_width,
+        font_size,
+        text_color,
+        bg_color,
+        padding,
+        max_width_ratio,
+        font_family,
+        use_pilmoji,
+        outline_width,
+    )
+    with _caption_strip_cache_lock:
+        strip = _caption_strip_cache.get(key)
+        if strip is not None:
+            _caption_strip_cache.move_to_end(key)
+            return strip
+
+    strip, complete = _render_caption_strip(*key)
+    strip_bytes = strip.width * strip.height * 4
+    if not complete or strip_bytes > CAPTION_STRIP_CACHE_BYTES:
+        return strip
+
+    with _caption_strip_cache_lock:
+        if key not in _caption_strip_cache:
+            _caption_strip_cache[key] = strip
+            _caption_strip_cache_bytes += strip_bytes
+            while _caption_strip_cache_bytes > CAPTION_STRIP_CACHE_BYTES:
+                _, evicted = _caption_strip_cache.popitem(last=False)
+                _caption_strip_cache_bytes -= evicted.width * evicted.height * 4
+    return strip
+
+
+def add_caption_to_image(
+    image_path: Path,
+    caption: str,
+    output_path: Optional[Path] = None,
+    font_size: int = 40,
+    position: str = "bottom",
+    text_color: Tuple[int, int, int, int] = (255, 255, 255, 255),
+    bg_color: Tuple[int, int, int, int] = (0, 0, 0, 180),
+    padding: int = 20,
+    max_width_ratio: float = 0.9,
+    font_family: str = "default",
+    max_dimension: Optional[int] = None,
+    use_pilmoji: bool = True,
+    outline_width: int = 0,
+) -> Path:
+    """
+    Add a caption overlay to an image with full emoji support.
+
+    This function uses a hybrid approach:
+    - Regular text is rendered with the selected font family
+    - Emojis are automatically rendered with an emoji-supporting font
+    - All Google Fonts support emojis through this hybrid rendering
+
+    Args:
+        image_path: Path to the input image
+        caption: Text to overlay on the image (emojis fully supported)
+        output_path: Path for the output image (if None, overwrites input)
+        font_size: Size of the font
+        position: Position of the caption ("top", "bottom", "center")
+        text_color: RGBA color for the text
+        bg_color: RGBA color for the background overlay
+        padding: Padding around the text
+        max_width_ratio: Maximum width of text as a ratio of image width
+        font_family: Font family to use (roboto, open_sans, lato, montserrat,
+                     poppins, raleway, oswald, ubuntu, playfair, merriweather,
+                     source_sans, impact, or default)
+        max_dimension: Optional cap on the longest side of the output, on top
+                       of the MAX_IMAGE_WIDTH cap. Trades resolution for
+                       speed: a JPEG at least twice the capped size on both
+                       sides is decoded at a reduced DCT scale (1/2 to 1/8).
+        use_pilmoji: Render emojis as Twemoji images through Pilmoji. When
+                     False, emojis come from the font's own color glyphs
+                     (e.g. Noto Color Emoji) and pilmoji is never imported.
+        outline_width: Width of a black outline around the text, in pixels
+
+    Returns:
+        Path to the output image
+    """
     if output_path is None:
         output_path = image_path
 
-    # Convert back to RGB if saving as JPEG
-    if output_path.suffix.lower() in [".jpg", ".jpeg"]:
-        img = img.convert("RGB")
+    # Nothing to draw: skip the decode/re-encode round trip entirely
+    if not caption or not caption.strip():
+        if Path(output_path) != Path(image_path):
+            shutil.copyfile(image_path, output_path)
+        return output_path
+
+    # JPEG output has no alpha channel, so the caption is blended straight
+    # onto an RGB base instead of round-tripping the whole image via RGBA
+    save_as_jpeg = Path(output_path).suffix.lower() in [".jpg", ".jpeg"]
+    base_mode = "RGB" if save_as_jpeg else "RGBA"
+
+    # Open the image, downsampling oversized uploads before any other work
+    img = Image.open(image_path)
+    max_size = (MAX_IMAGE_WIDTH, img.height)
+    if max_dimension:
+        max_size = (min(MAX_IMAGE_WIDTH, max_dimension), max_dimension)
+    if img.width > max_size[0] or img.height > max_size[1]:
+        # Aspect-preserving target inside the box; draft() only picks a
+        # reduced JPEG DCT scale when both sides of its size can shrink
+        scale = min(max_size[0] / img.width, max_size[1] / img.height)
+        target_size = (
+            max(1, round(img.width * scale)),
+            max(1, round(img.height * scale)),
+        )
+        # Let the JPEG decoder scale down while decoding where it can
+        img.draft("RGB", target_size)
+        img.thumbnail(max_size, Image.Resampling.LANCZOS)
+    if img.mode != base_mode:
+        img = img.convert(base_mode)
+    img_width, img_height = img.size
+
+    # Build (or reuse) the caption strip and place it
+    overlay = _build_caption_strip(
+        caption,
+        img_width,
+        font_size,
+        tuple(text_color),
+        tuple(bg_color),
+        padding,
+        max_width_ratio,
+        font_family,
+        use_pilmoji,
+        outline_width,
+    )
+    bg_height = overlay.height
+
+    # Determine vertical position
+    if position == "top":
+        bg_y = 0
+    elif position == "center":
+        bg_y = (img_height - bg_height) // 2
+    else:  # bottom
+        bg_y = img_height - bg_height
+
+    # Composite the caption strip onto the original image in place. A fully
+    # opaque strip (background and text) covers everything under it, so it is
+    # copied without blending.
+    bg_opaque = len(bg_color) < 4 or bg_color[3] == 255
+    text_opaque = len(text_color) < 4 or text_color[3] == 255
+    if bg_opaque and text_opaque:
+        img.paste(overlay, (0, bg_y))
+    elif save_as_jpeg:
+        img.paste(overlay, (0, bg_y), mask=overlay)
+    else:
+        img.alpha_composite(overlay, dest=(0, bg_y))
 
-    img.save(output_path)
+    # Save the result
+    if save_as_jpeg:
+        img.save(output_path, "JPEG", **JPEG_SAVE_OPTIONS)
+    else:
+        img.save(output_path)
     return output_path
 
 
@@ -396,6 +811,8 @@ def embed_caption_on_image(
     padding: int = 20,
     max_width_ratio: float = 0.9,
     font_family: str = "default",
+    use_pilmoji: bool = True,
+    outline_width: int = 0,
 ) -> str:
     """
     Convenience wrapper for adding caption to image with full emoji support.
@@ -417,6 +834,8 @@ def embed_caption_on_image(
         font_family: Font family (roboto, open_sans, lato, montserrat, poppins,
                      raleway, oswald, ubuntu, playfair, merriweather,
                      source_sans, impact, or default)
+        use_pilmoji: Render emojis through Pilmoji (see add_caption_to_image)
+        outline_width: Width of a black outline around the text, in pixels
 
     Returns:
         Path to the output image (same as input, modified in place)
@@ -437,6 +856,8 @@ def embed_caption_on_image(
         padding=padding,
         max_width_ratio=max_width_ratio,
         font_family=font_family,
+        use_pilmoji=use_pilmoji,
+        outline_width=outline_width,
     )
 
     return str(result_path)
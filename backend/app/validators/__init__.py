@@ -8,6 +8,10 @@ from typing import Optional
 from app.constants import PLATFORM_CONFIG
 from app.exceptions import ValidationError
 
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+_USERNAME_RE = re.compile(r"^[a-zA-Z0-9_-]+$")
+_URL_RE = re.compile(r'^https?://[^\s<>"{}|\\^`\[\]]+$')
+
 
 def validate_email(email: str) -> str:
     """
@@ -23,9 +27,8 @@ def validate_email(email: str) -> str:
         ValidationError: If email format is invalid
     """
     email = email.lower().strip()
-    email_regex = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
 
-    if not re.match(email_regex, email):
+    if not _EMAIL_RE.match(email):
         raise ValidationError("Invalid email format")
 
     return email
@@ -52,7 +55,7 @@ def validate_username(username: str) -> str:
     if len(username) > 30:
         raise ValidationError("Username must not exceed 30 characters")
 
-    if not re.match(r"^[a-zA-Z0-9_-]+$", username):
+    if not _USERNAME_RE.match(username):
         raise ValidationError(
             "Username can only contain letters, numbers, underscores, and hyphens"
         )
@@ -73,13 +76,25 @@ def validate_password(password: str) -> None:
     if len(password) < 8:
         raise ValidationError("Password must be at least 8 characters long")
 
-    if not re.search(r"[A-Z]", password):
+    # Single pass over the password; only ASCII letters and digits count
+    has_upper = has_lower = has_digit = False
+    for char in password:
+        if "A" <= char <= "Z":
+            has_upper = True
+        elif "a" <= char <= "z":
+            has_lower = True
+        elif "0" <= char <= "9":
+            has_digit = True
+        if has_upper and has_lower and has_digit:
+            break
+
+    if not has_upper:
         raise ValidationError("Password must contain at least one uppercase letter")
 
-    if not re.search(r"[a-z]", password):
+    if not has_lower:
         raise ValidationError("Password must contain at least one lowercase letter")
 
-    if not re.search(r"[0-9]", password):
+    if not has_digit:
         raise ValidationError("Password must contain at least one number")
 
 
@@ -150,15 +165,10 @@ def validate_image_url(url: Optional[str]) -> Optional[str]:
     url = url.strip()
 
     # Basic URL validation
-    url_regex = r'^https?://[^\s<>"{}|\\^`\[\]]+$'
-    if not re.match(url_regex, url):
+    if not _URL_RE.match(url):
         raise ValidationError("Invalid URL format")
 
-    # Check for common image extensions
-    image_extensions = (".jpg", ".jpeg", ".png", ".gif", ".webp")
-    if not any(url.lower().endswith(ext) for ext in image_extensions):
-        # It's okay if URL doesn't end with extension (could be dynamic URL)
-        pass
+    # No image extension check: dynamic image URLs often don't have one
 
     return url
 
@@ -227,16 +237,5 @@ def validate_platform_list(platforms: list[str]) -> list[str]:
     if not platforms:
         raise ValidationError("At least one platform must be selected")
 
-    validated = []
-    for platform in platforms:
-        validated.append(validate_platform(platform))
-
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_platforms = []
-    for platform in validated:
-        if platform not in seen:
-            seen.add(platform)
-            unique_platforms.append(platform)
-
-    return unique_platforms
+    # Validate and drop duplicates in one pass, preserving order
+    return list(dict.fromkeys(validate_platform(platform) for platform in platforms))
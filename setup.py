@@ -3,190 +3,382 @@ Setup script for initial project configuration.
 Run this after cloning the repository.
 """
 
+import argparse
+import hashlib
+import io
 import os
 import sys
+import shutil
 import subprocess
+import venv
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, List, TextIO, Tuple
 
+# Project directories, relative to the project root the script runs from
+BACKEND_DIR = Path("backend")
+FRONTEND_DIR = Path("frontend")
 
-def print_header(text: str):
+# Closing instructions printed by print_next_steps
+NEXT_STEPS_TEMPLATE = """\
+Next steps:
+
+1. Configure your environment variables:
+   - Edit backend/.env with your API keys and database credentials
+   - Edit frontend/.env.local if needed
+
+2. Start PostgreSQL and Redis:
+   - Option A: Using Docker Compose
+     docker-compose up -d postgres redis
+   - Option B: Install and start manually
+
+3. Run database migrations:
+   cd backend
+   {activate_command}
+   alembic upgrade head
+
+4. Start the development servers:
+   - Backend: cd backend && uvicorn app.main:app --reload
+   - Frontend: cd frontend && npm run dev
+
+5. Access the application:
+   - Frontend: http://localhost:3000
+   - Backend API: http://localhost:8000
+   - API Docs: http://localhost:8000/api/docs
+
+For more information, see:
+   - docs/ARCHITECTURE.md - Project architecture
+   - docs/CONTRIBUTING.md - Contributing guidelines
+   - README.md - Complete documentation
+
+""" + "=" * 60 + "\n"
+
+
+def print_header(text: str, out: TextIO = None):
     """Print formatted header."""
-    print("\n" + "=" * 60)
-    print(f"  {text}")
-    print("=" * 60 + "\n")
+    print("\n" + "=" * 60, file=out)
+    print(f"  {text}", file=out)
+    print("=" * 60 + "\n", file=out)
 
 
-def run_command(command: str, cwd: str = None) -> bool:
-    """Run shell command and return success status."""
+def run_command(argv: List[str], cwd: str = None, out: TextIO = None) -> bool:
+    """
+    Run a command (without a shell) and return success status.
+
+    When out is given, the command's combined output is read through one
+    pipe and only written to out if the command fails; otherwise the command
+    writes straight to the terminal.
+    """
     try:
-        subprocess.run(command, shell=True, check=True, cwd=cwd)
+        if out is None:
+            subprocess.run(argv, check=True, cwd=cwd)
+            return True
+
+        result = subprocess.run(
+            argv,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+        )
+        if result.returncode != 0:
+            out.write(result.stdout)
+            return False
         return True
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, OSError):
         return False
 
 
-def check_prerequisites():
+def check_prerequisites(out: TextIO = None):
     """Check if required tools are installed."""
-    print_header("Checking Prerequisites")
+    print_header("Checking Prerequisites", out)
 
-    required_tools = {
-        "python": "python --version",
-        "node": "node --version",
-        "npm": "npm --version",
-        "docker": "docker --version",
-    }
+    required_tools = ["node", "npm", "docker"]
 
     missing_tools = []
 
-    for tool, command in required_tools.items():
-        if run_command(command):
-            print(f"✓ {tool} is installed")
+    # Python is the interpreter running this script (and the one the venv is
+    # built from), so it needs no lookup
+    version = "{}.{}.{}".format(*sys.version_info[:3])
+    print(f"✓ python is installed ({version})", file=out)
+
+    # Look the other tools up on PATH in-process instead of running each one
+    for tool in required_tools:
+        if shutil.which(tool) is not None:
+            print(f"✓ {tool} is installed", file=out)
         else:
-            print(f"✗ {tool} is NOT installed")
+            print(f"✗ {tool} is NOT installed", file=out)
             missing_tools.append(tool)
 
     if missing_tools:
-        print(f"\n⚠️  Missing tools: {', '.join(missing_tools)}")
-        print("Please install the missing tools and try again.")
+        print(f"\n⚠️  Missing tools: {', '.join(missing_tools)}", file=out)
+        print("Please install the missing tools and try again.", file=out)
         return False
 
-    print("\n✓ All prerequisites are installed!")
+    print("\n✓ All prerequisites are installed!", file=out)
     return True
 
 
-def setup_backend():
-    """Setup backend environment."""
-    print_header("Setting Up Backend")
-
-    backend_dir = Path("backend")
+def copy_if_missing(src: Path, dst: Path) -> bool:
+    """
+    Copy src to dst unless dst already exists; return whether it was copied.
 
-    # Create virtual environment
-    print("Creating Python virtual environment...")
-    if not run_command("python -m venv venv", cwd=str(backend_dir)):
-        print("✗ Failed to create virtual environment")
+    dst is opened with exclusive create (O_CREAT | O_EXCL), so the existence
+    check and the creation are a single step with no race between them. src
+    is only opened once dst has been created, and a partly written dst is
+    removed if the copy fails.
+    """
+    try:
+        target = open(dst, "xb")
+    except FileExistsError:
         return False
-    print("✓ Virtual environment created")
 
-    # Install dependencies
-    print("\nInstalling Python dependencies...")
-    pip_command = "venv\\Scripts\\pip" if sys.platform == "win32" else "venv/bin/pip"
-    if not run_command(
-        f"{pip_command} install -r requirements-dev.txt", cwd=str(backend_dir)
-    ):
-        print("✗ Failed to install dependencies")
+    try:
+        with target, open(src, "rb") as source:
+            shutil.copyfileobj(source, target)
+    except BaseException:
+        Path(dst).unlink(missing_ok=True)
+        raise
+    return True
+
+
+def venv_interpreter(venv_dir: Path) -> Path:
+    """Return the path of the Python interpreter inside a virtual environment."""
+    if os.name == "nt":
+        return venv_dir / "Scripts" / "python.exe"
+    return venv_dir / "bin" / "python"
+
+
+def venv_matches_interpreter(venv_dir: Path) -> bool:
+    """Check whether venv_dir is a virtual environment for this Python version."""
+    try:
+        config = (venv_dir / "pyvenv.cfg").read_text()
+    except OSError:
         return False
-    print("✓ Dependencies installed")
+
+    current = "{}.{}.{}".format(*sys.version_info[:3])
+    for line in config.splitlines():
+        key, _, value = line.partition("=")
+        if key.strip() in ("version", "version_info") and value.strip() == current:
+            return True
+    return False
+
+
+def requirements_fingerprint(requirements_file: Path) -> str:
+    """
+    Hash a requirements file, every file it pulls in, and the Python version.
+
+    Nested files referenced with -r/--requirement or -c/--constraint are
+    followed, relative to the file that names them. Raises OSError if any of
+    the files can't be read.
+    """
+    digest = hashlib.sha256("{}.{}.{}".format(*sys.version_info[:3]).encode())
+    pending = [requirements_file.resolve()]
+    seen = set()
+    while pending:
+        path = pending.pop(0)
+        if path in seen:
+            continue
+        seen.add(path)
+
+        data = path.read_bytes()
+        digest.update(str(path).encode() + b"\0" + data + b"\0")
+        for line in data.decode("utf-8", errors="replace").splitlines():
+            option, _, value = line.strip().replace("=", " ", 1).partition(" ")
+            if option in ("-r", "--requirement", "-c", "--constraint") and value.strip():
+                pending.append((path.parent / value.strip()).resolve())
+    return digest.hexdigest()
+
+
+def setup_backend(out: TextIO = None):
+    """Setup backend environment."""
+    print_header("Setting Up Backend", out)
+
+    backend_dir = BACKEND_DIR
+
+    # Create virtual environment in-process (symlinked interpreter on POSIX),
+    # reusing one that was already created for this Python version
+    venv_dir = backend_dir.resolve() / "venv"
+    if venv_matches_interpreter(venv_dir):
+        print("✓ Virtual environment already exists", file=out)
+    else:
+        print("Creating Python virtual environment...", file=out)
+        try:
+            # clear=True drops anything left from a venv for another Python,
+            # including its install stamp
+            venv.EnvBuilder(
+                with_pip=True, symlinks=(os.name != "nt"), clear=True
+            ).create(venv_dir)
+        except Exception:
+            print("✗ Failed to create virtual environment", file=out)
+            return False
+        print("✓ Virtual environment created", file=out)
+
+    # Install dependencies, unless the requirements (including nested -r
+    # files) and the interpreter are unchanged since the last successful
+    # install
+    requirements_file = backend_dir / "requirements-dev.txt"
+    install_stamp = venv_dir / ".requirements-installed"
+    try:
+        fingerprint = requirements_fingerprint(requirements_file)
+    except OSError:
+        fingerprint = None
+    try:
+        up_to_date = fingerprint is not None and install_stamp.read_text() == fingerprint
+    except OSError:
+        up_to_date = False
+
+    if up_to_date:
+        print("\n✓ Dependencies already installed", file=out)
+    else:
+        print("\nInstalling Python dependencies...", file=out)
+        venv_python = str(venv_interpreter(venv_dir))
+        uv_command = shutil.which("uv")
+        if uv_command:
+            # uv resolves and downloads in parallel; use it when it's installed
+            install_command = [uv_command, "pip", "install", "--python", venv_python]
+        else:
+            install_command = [
+                venv_python,
+                "-m",
+                "pip",
+                "install",
+                "--disable-pip-version-check",
+                "--no-compile",
+                "--prefer-binary",
+            ]
+        if not run_command(
+            install_command + ["-r", requirements_file.name],
+            cwd=str(backend_dir),
+            out=out,
+        ):
+            print("✗ Failed to install dependencies", file=out)
+            return False
+        if fingerprint is not None:
+            install_stamp.write_text(fingerprint)
+        print("✓ Dependencies installed", file=out)
 
     # Copy .env.example to .env
     env_example = backend_dir / ".env.example"
     env_file = backend_dir / ".env"
 
-    if not env_file.exists():
-        print("\nCreating .env file...")
-        env_file.write_text(env_example.read_text())
-        print("✓ .env file created")
-        print("⚠️  Please edit backend/.env with your configuration")
+    if copy_if_missing(env_example, env_file):
+        print("\nCreating .env file...", file=out)
+        print("✓ .env file created", file=out)
+        print("⚠️  Please edit backend/.env with your configuration", file=out)
     else:
-        print("\n✓ .env file already exists")
+        print("\n✓ .env file already exists", file=out)
 
     # Create necessary directories
-    print("\nCreating directories...")
-    (backend_dir / "logs").mkdir(exist_ok=True)
-    (backend_dir / "uploads" / "images" / "temp").mkdir(parents=True, exist_ok=True)
-    print("✓ Directories created")
+    print("\nCreating directories...", file=out)
+    for directory in (backend_dir / "logs", backend_dir / "uploads" / "images" / "temp"):
+        directory.mkdir(parents=True, exist_ok=True)
+    print("✓ Directories created", file=out)
 
     return True
 
 
-def setup_frontend():
+def setup_frontend(out: TextIO = None):
     """Setup frontend environment."""
-    print_header("Setting Up Frontend")
+    print_header("Setting Up Frontend", out)
 
-    frontend_dir = Path("frontend")
+    frontend_dir = FRONTEND_DIR
 
     # Install dependencies
-    print("Installing Node.js dependencies...")
-    if not run_command("npm install", cwd=str(frontend_dir)):
-        print("✗ Failed to install dependencies")
+    print("Installing Node.js dependencies...", file=out)
+    # Resolve npm through PATH so Windows picks up npm.cmd without a shell
+    npm_command = shutil.which("npm") or "npm"
+    # A fresh checkout installs straight from the lockfile with npm ci, which
+    # skips dependency resolution; an existing node_modules is updated in place
+    has_lockfile = (frontend_dir / "package-lock.json").is_file()
+    fresh_install = has_lockfile and not (frontend_dir / "node_modules").is_dir()
+    npm_args = [
+        "ci" if fresh_install else "install",
+        "--prefer-offline",
+        "--no-audit",
+        "--no-fund",
+    ]
+    if not run_command([npm_command] + npm_args, cwd=str(frontend_dir), out=out):
+        print("✗ Failed to install dependencies", file=out)
         return False
-    print("✓ Dependencies installed")
+    print("✓ Dependencies installed", file=out)
 
     # Copy .env.local.example to .env.local
     env_example = frontend_dir / ".env.local.example"
     env_file = frontend_dir / ".env.local"
 
-    if not env_file.exists():
-        print("\nCreating .env.local file...")
-        env_file.write_text(env_example.read_text())
-        print("✓ .env.local file created")
-        print("⚠️  Please edit frontend/.env.local if needed")
+    if copy_if_missing(env_example, env_file):
+        print("\nCreating .env.local file...", file=out)
+        print("✓ .env.local file created", file=out)
+        print("⚠️  Please edit frontend/.env.local if needed", file=out)
     else:
-        print("\n✓ .env.local file already exists")
+        print("\n✓ .env.local file already exists", file=out)
 
     return True
 
 
+def run_setup_step(step: Callable[[TextIO], bool]) -> Tuple[bool, str]:
+    """Run a setup step, returning its status and buffered output."""
+    out = io.StringIO()
+    return step(out), out.getvalue()
+
+
 def print_next_steps():
     """Print next steps for the user."""
     print_header("Setup Complete!")
 
-    print("Next steps:")
-    print("\n1. Configure your environment variables:")
-    print("   - Edit backend/.env with your API keys and database credentials")
-    print("   - Edit frontend/.env.local if needed")
-
-    print("\n2. Start PostgreSQL and Redis:")
-    print("   - Option A: Using Docker Compose")
-    print("     docker-compose up -d postgres redis")
-    print("   - Option B: Install and start manually")
-
-    print("\n3. Run database migrations:")
-    print("   cd backend")
     if sys.platform == "win32":
-        print("   venv\\Scripts\\activate")
+        activate_command = "venv\\Scripts\\activate"
     else:
-        print("   source venv/bin/activate")
-    print("   alembic upgrade head")
-
-    print("\n4. Start the development servers:")
-    print("   - Backend: cd backend && uvicorn app.main:app --reload")
-    print("   - Frontend: cd frontend && npm run dev")
-
-    print("\n5. Access the application:")
-    print("   - Frontend: http://localhost:3000")
-    print("   - Backend API: http://localhost:8000")
-    print("   - API Docs: http://localhost:8000/api/docs")
-
-    print("\nFor more information, see:")
-    print("   - docs/ARCHITECTURE.md - Project architecture")
-    print("   - docs/CONTRIBUTING.md - Contributing guidelines")
-    print("   - README.md - Complete documentation")
-
-    print("\n" + "=" * 60)
+        activate_command = "source venv/bin/activate"
+    sys.stdout.write(NEXT_STEPS_TEMPLATE.format(activate_command=activate_command))
 
 
 def main():
     """Main setup function."""
+    parser = argparse.ArgumentParser(description="Set up the development environment.")
+    parser.add_argument(
+        "--only",
+        choices=("all", "backend", "frontend"),
+        default="all",
+        help="set up only one side of the project (default: all)",
+    )
+    args = parser.parse_args()
+
     print_header("Social Media Automation Platform - Setup")
 
-    # Check if we're in the project root
-    if not Path("backend").exists() or not Path("frontend").exists():
+    # Check if we're in the project root, with one directory listing instead
+    # of a stat per directory
+    with os.scandir(".") as entries:
+        root_dirs = {entry.name for entry in entries if entry.is_dir()}
+    if not {BACKEND_DIR.name, FRONTEND_DIR.name} <= root_dirs:
         print("✗ Error: Please run this script from the project root directory")
         sys.exit(1)
 
-    # Check prerequisites
-    if not check_prerequisites():
+    # Check prerequisites; like the setup steps, its report is written in one go
+    prerequisites_ok, prerequisites_output = run_setup_step(check_prerequisites)
+    print(prerequisites_output, end="")
+    if not prerequisites_ok:
         sys.exit(1)
 
-    # Setup backend
-    if not setup_backend():
-        print("\n✗ Backend setup failed")
-        sys.exit(1)
-
-    # Setup frontend
-    if not setup_frontend():
-        print("\n✗ Frontend setup failed")
-        sys.exit(1)
+    # Setup the selected sides concurrently; they install into separate
+    # directories (backend/venv, frontend/node_modules). Each step buffers its
+    # messages so the two reports don't interleave.
+    steps = [
+        ("Backend", setup_backend, args.only in ("all", "backend")),
+        ("Frontend", setup_frontend, args.only in ("all", "frontend")),
+    ]
+    steps = [(name, step) for name, step, selected in steps if selected]
+    with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+        futures = [(name, executor.submit(run_setup_step, step)) for name, step in steps]
+        results = [(name, future.result()) for name, future in futures]
+
+    for name, (ok, output) in results:
+        print(output, end="")
+        if not ok:
+            print(f"\n✗ {name} setup failed")
+            sys.exit(1)
 
     # Print next steps
     print_next_steps()